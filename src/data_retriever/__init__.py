@@ -3,5 +3,9 @@ from .embedder import ProductEmbedder
 from .weaviate import WeaviateHandler
 from .gradio_search import GradioSearchApp
 from .offers import OffersDatabase
+from .catalog_sync import CatalogSync
+from .autocomplete import ProductAutocomplete
+from .facets import CategoryIndex
+from .shared_catalog import SharedCatalog
 
-__all__ = ["ProductDataCleaner", "ProductEmbedder", "WeaviateHandler", "GradioSearchApp", "OffersDatabase"]
\ No newline at end of file
+__all__ = ["ProductDataCleaner", "ProductEmbedder", "WeaviateHandler", "GradioSearchApp", "OffersDatabase", "CatalogSync", "ProductAutocomplete", "CategoryIndex", "SharedCatalog"]
\ No newline at end of file
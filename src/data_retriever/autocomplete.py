@@ -0,0 +1,150 @@
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+
+from src.utils import logging, config
+from .catalog_sync import CatalogSync
+from .facets import split_categories
+
+
+class ProductAutocomplete:
+    """In-memory prefix index over product titles and categories for typeahead suggestions.
+
+    Entries are kept in one sorted list of (key, kind, ref) tuples, so a lookup is a bisect
+    to the first key starting with the prefix followed by a short forward scan.
+    Gradio calls suggest() and refresh() from several threads, so both run under one lock.
+    """
+
+    def __init__(self, records=None,
+                 version_path=config["catalog_sync"]["version_path"],
+                 max_suggestions=config["autocomplete"]["max_suggestions"],
+                 min_prefix_length=config["autocomplete"]["min_prefix_length"]):
+        self.version_path = version_path
+        self.max_suggestions = max_suggestions
+        self.min_prefix_length = min_prefix_length
+        self._entries = []
+        self._products = {}
+        self._categories = {}
+        self._lock = threading.RLock()
+        self._version_mtime = self._current_mtime()
+
+        for product_id, properties in (records if records is not None else CatalogSync.load_records()).items():
+            self.add(product_id, properties)
+        logging.info(f"Autocomplete index built with {len(self._products)} products and {len(self._entries)} entries.")
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+    def _title_keys(self, title):
+        """The full title plus every suffix starting at a word, so "raw" matches "Almonds Raw 300g"."""
+        words = self.normalize(title).split(" ")
+        return {" ".join(words[i:]) for i in range(len(words))}
+
+    def _insert(self, entry):
+        index = bisect_left(self._entries, entry)
+        if index == len(self._entries) or self._entries[index] != entry:
+            self._entries.insert(index, entry)
+
+    def _discard(self, entry):
+        index = bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
+
+    def add(self, product_id, properties):
+        """Index one product, replacing any previous version of it."""
+        product_id = str(product_id)
+        with self._lock:
+            self.remove(product_id)
+            if not properties.get("title"):
+                return
+
+            categories = split_categories(properties.get("categories"))
+            self._products[product_id] = {
+                "title": properties["title"],
+                "categories": categories,
+                "rating": properties.get("rating") or 0.0,
+            }
+            for key in self._title_keys(properties["title"]):
+                insort(self._entries, (key, "product", product_id))
+            for category in categories:
+                if category not in self._categories:
+                    self._categories[category] = set()
+                    self._insert((self.normalize(category), "category", category))
+                self._categories[category].add(product_id)
+
+    def remove(self, product_id):
+        """Drop a product and any category left without products."""
+        with self._lock:
+            product = self._products.pop(str(product_id), None)
+            if product is None:
+                return
+            for key in self._title_keys(product["title"]):
+                self._discard((key, "product", str(product_id)))
+            for category in product["categories"]:
+                members = self._categories.get(category)
+                if members is None:
+                    continue
+                members.discard(str(product_id))
+                if not members:
+                    del self._categories[category]
+                    self._discard((self.normalize(category), "category", category))
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.version_path).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Apply catalog changes published since the last refresh. Cheap no-op when nothing changed."""
+        mtime = self._current_mtime()
+        if mtime == self._version_mtime:
+            return False
+
+        # Read the snapshot outside the lock so lookups keep running meanwhile
+        records = CatalogSync.load_records()
+        with self._lock:
+            if mtime == self._version_mtime:
+                return False
+            self._version_mtime = mtime
+            for product_id in set(self._products) - set(records):
+                self.remove(product_id)
+            for product_id, properties in records.items():
+                current = self._products.get(product_id)
+                if current is None or current["title"] != properties.get("title") \
+                        or current["categories"] != split_categories(properties.get("categories")):
+                    self.add(product_id, properties)
+                else:
+                    current["rating"] = properties.get("rating") or 0.0
+        logging.info("Autocomplete index refreshed after catalog change.")
+        return True
+
+    def _rating(self, kind, ref):
+        if kind == "product":
+            return self._products[ref]["rating"]
+        return max(self._products[product_id]["rating"] for product_id in self._categories[ref])
+
+    def suggest(self, prefix, limit=None):
+        """Top suggestions for `prefix`, highest rated first."""
+        prefix = self.normalize(prefix)
+        if len(prefix) < self.min_prefix_length:
+            return []
+
+        with self._lock:
+            matches = set()
+            index = bisect_left(self._entries, (prefix,))
+            while index < len(self._entries) and self._entries[index][0].startswith(prefix):
+                _, kind, ref = self._entries[index]
+                matches.add((kind, ref))
+                index += 1
+
+            ranked = sorted(matches, key=lambda match: (-self._rating(*match), match[1]))
+            suggestions = []
+            for kind, ref in ranked[:limit or self.max_suggestions]:
+                if kind == "product":
+                    suggestions.append({"type": kind, "text": self._products[ref]["title"], "product_id": ref, "rating": self._products[ref]["rating"]})
+                else:
+                    suggestions.append({"type": kind, "text": ref, "product_count": len(self._categories[ref]), "rating": self._rating(kind, ref)})
+            return suggestions
@@ -0,0 +1,159 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+from src.utils import logging, config
+
+# Fields that feed the embedding (see ProductEmbedder.generate_embeddings) vs. plain filterable properties
+TEXT_FIELDS = ["title", "description", "categories"]
+SCALAR_FIELDS = ["price", "stock_status", "rating", "weight", "image"]
+
+
+class CatalogSync:
+    """Incrementally syncs a products CSV into Weaviate by diffing it against the last ingested snapshot."""
+
+    def __init__(self, search_engine,
+                 snapshot_path=config["catalog_sync"]["snapshot_path"],
+                 version_path=config["catalog_sync"]["version_path"]):
+        self.search_engine = search_engine
+        self.snapshot_path = snapshot_path
+        self.version_path = version_path
+
+    @staticmethod
+    def content_hash(row, fields):
+        """Stable hash of the given fields of a catalog row."""
+        values = {field: None if pd.isna(row[field]) else str(row[field]) for field in fields}
+        return hashlib.sha1(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def deduplicate(df):
+        """Keep the last row for each product ID, matching what Weaviate ends up storing."""
+        duplicates = df["id"].duplicated(keep="last")
+        if duplicates.any():
+            logging.warning(f"Dropping {int(duplicates.sum())} duplicate product rows.")
+        return df[~duplicates]
+
+    def build_records(self, df):
+        """Snapshot records keyed by product ID: content hashes plus the stored properties."""
+        records = {}
+        for _, row in df.iterrows():
+            properties = self.search_engine.product_properties(row)
+            records[properties["product_id"]] = {
+                "text_hash": self.content_hash(row, TEXT_FIELDS),
+                "scalar_hash": self.content_hash(row, SCALAR_FIELDS),
+                "properties": properties,
+            }
+        return records
+
+    @staticmethod
+    def load_records(snapshot_path=config["catalog_sync"]["snapshot_path"]):
+        """Product properties keyed by ID, from the last ingested snapshot or else the cleaned CSV."""
+        snapshot = CatalogSync(None, snapshot_path=snapshot_path).load_snapshot()
+        if snapshot is not None:
+            return {product_id: record["properties"] for product_id, record in snapshot["products"].items()}
+
+        df = pd.read_csv(config["input_file"]["cleaned_products_data_path"])
+        return {
+            str(row["id"]): {
+                "title": None if pd.isna(row["title"]) else str(row["title"]),
+                "categories": None if pd.isna(row["categories"]) else row["categories"],
+                "rating": None if pd.isna(row["rating"]) else row["rating"],
+                "image": None if pd.isna(row["image"]) else row["image"],
+                "stock_status": None if pd.isna(row["stock_status"]) else row["stock_status"],
+            }
+            for _, row in df.iterrows()
+        }
+
+    def load_snapshot(self):
+        """Load the last ingested snapshot, or None if the catalog was never ingested."""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _write_json(path, data):
+        """Write JSON atomically so readers never see a half-written file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def current_version(version_path=config["catalog_sync"]["version_path"]):
+        """Published catalog version; caches compare it to decide when to invalidate."""
+        if not os.path.exists(version_path):
+            return 0
+        with open(version_path, "r", encoding="utf-8") as file:
+            return json.load(file)["version"]
+
+    def save_snapshot(self, df):
+        """Record `df` as the ingested catalog and publish a new catalog version."""
+        version = self.current_version(self.version_path) + 1
+        snapshot = {
+            "version": version,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "products": self.build_records(self.deduplicate(df)),
+        }
+        self._write_json(self.snapshot_path, snapshot)
+        self._write_json(self.version_path, {"version": version, "updated_at": snapshot["updated_at"]})
+        logging.info(f"Catalog snapshot saved, version {version}.")
+        return version
+
+    @staticmethod
+    def diff(old_records, new_records):
+        """Split the changes into added, removed, re-embed (text changed) and patch-only (scalar changed) IDs."""
+        old_ids, new_ids = set(old_records), set(new_records)
+        added = new_ids - old_ids
+        removed = old_ids - new_ids
+        text_changed, scalar_changed = set(), set()
+        for product_id in new_ids & old_ids:
+            if new_records[product_id]["text_hash"] != old_records[product_id]["text_hash"]:
+                text_changed.add(product_id)
+            elif new_records[product_id]["scalar_hash"] != old_records[product_id]["scalar_hash"]:
+                scalar_changed.add(product_id)
+        return added, removed, text_changed, scalar_changed
+
+    def sync(self, df):
+        """Apply only the catalog changes since the last snapshot. Returns a summary of what changed."""
+        snapshot = self.load_snapshot()
+        if snapshot is None:
+            raise RuntimeError("No catalog snapshot found. Run vector_database_creation first.")
+
+        df = self.deduplicate(df)
+        new_records = self.build_records(df)
+        added, removed, text_changed, scalar_changed = self.diff(snapshot["products"], new_records)
+        summary = {
+            "added": len(added),
+            "removed": len(removed),
+            "reembedded": len(text_changed),
+            "patched": len(scalar_changed),
+        }
+        logging.info(f"Catalog diff: {summary}")
+
+        if not (added or removed or text_changed or scalar_changed):
+            summary["version"] = snapshot["version"]
+            return summary
+
+        to_embed = added | text_changed
+        if to_embed:
+            changed_df = df[df["id"].astype(str).isin(to_embed)].copy()
+            changed_df = self.search_engine.embedder.generate_embeddings(changed_df)
+            self.search_engine.insert_data(changed_df)
+
+        for product_id in scalar_changed:
+            properties = new_records[product_id]["properties"]
+            self.search_engine.update_properties(
+                product_id, {field: properties[field] for field in SCALAR_FIELDS}
+            )
+
+        self.search_engine.delete_products(removed)
+
+        summary["version"] = self.save_snapshot(df)
+        return summary
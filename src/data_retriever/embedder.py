@@ -1,15 +1,16 @@
-from sentence_transformers import SentenceTransformer
+import os
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
 
 from src.utils import logging, config
 
 class ProductEmbedder:
     """Handles embedding generation for product data."""
-    
-    def __init__(self):
+
+    def __init__(self, model_type=None, quantize=None):
         """Initialize the embedding model based on the config file."""
-        self.model_type = config['embedding']['model_type'] 
+        self.model_type = model_type or config['embedding']['model_type']
         self.model_name = config['embedding']['model_name']
-        
+
         if self.model_type == "sentencetransformer":
             try:
                 self.model = SentenceTransformer(self.model_name)
@@ -17,21 +18,68 @@ class ProductEmbedder:
             except Exception as e:
                 logging.error(f"Error initializing embedding model: {e}")
                 raise
+        elif self.model_type == "onnx":
+            try:
+                self.model = self._load_onnx_model(quantize)
+                logging.info(f"ONNX embedding model '{self.model_name}' initialized successfully.")
+            except Exception as e:
+                logging.error(f"Error initializing ONNX embedding model: {e}")
+                raise
         else:
             logging.error(f"Model type '{self.model_type}' is not supported yet.")
             raise ValueError(f"Unsupported model type: {self.model_type}")
 
+    @staticmethod
+    def ensure_onnx_export(quantize=None):
+        """Export (and optionally int8-quantize) the model to ONNX unless already done.
+        Returns the export directory and the model file to load. Multi-process servers call this
+        once before forking so workers never write the export concurrently."""
+        model_name = config['embedding']['model_name']
+        onnx_config = config['embedding']['onnx']
+        export_dir = onnx_config['export_dir']
+        quantize = onnx_config['quantize'] if quantize is None else quantize
+        file_name = "onnx/model.onnx"
+
+        if not os.path.exists(os.path.join(export_dir, file_name)):
+            logging.info(f"Exporting '{model_name}' to ONNX in {export_dir}...")
+            SentenceTransformer(model_name, backend="onnx").save_pretrained(export_dir)
+
+        if quantize:
+            quantization_config = onnx_config['quantization_config']
+            file_name = f"onnx/model_qint8_{quantization_config}.onnx"
+            if not os.path.exists(os.path.join(export_dir, file_name)):
+                logging.info(f"Quantizing ONNX model to int8 ({quantization_config})...")
+                export_dynamic_quantized_onnx_model(
+                    SentenceTransformer(export_dir, backend="onnx"), quantization_config, export_dir
+                )
+
+        return export_dir, file_name
+
+    def _load_onnx_model(self, quantize=None):
+        """Load the model on ONNX Runtime, exporting it first if needed."""
+        export_dir, file_name = self.ensure_onnx_export(quantize)
+        return SentenceTransformer(
+            export_dir,
+            backend="onnx",
+            model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"},
+            tokenizer_kwargs={"use_fast": True}
+        )
+
+    @staticmethod
+    def combined_text(df):
+        """Text that gets embedded for each product."""
+        return df.apply(lambda x: f"title: {x['title']} description: {x['description']} categories: {x['categories']}", axis=1)
 
     def generate_embeddings(self, df):
         """Generate and combine embeddings for the title and description."""
         try:
             logging.info("Generating embeddings...")
 
-            df["combined_text"] = df.apply(lambda x: f"title: {x['title']} description: {x['description']} categories: {x['categories']}", axis=1)
-            df["info_vector"] = df["combined_text"].apply(lambda x: self.model.encode(x))
+            df["combined_text"] = self.combined_text(df)
+            df["info_vector"] = list(self.model.encode(df["combined_text"].tolist()))
 
             logging.info("Embeddings generated and validated successfully.")
             return df
         except Exception as e:
             logging.error(f"Error generating embeddings: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+from src.utils import logging, config
+from .catalog_sync import CatalogSync
+
+
+def split_categories(categories):
+    """Turn the comma-joined categories string from the catalog into a clean list."""
+    if isinstance(categories, list):
+        return [category.strip() for category in categories if category and category.strip()]
+    if categories is None or pd.isna(categories):
+        return []
+    return [category.strip() for category in str(categories).split(",") if category.strip()]
+
+
+class CategoryIndex:
+    """Category -> product ID inverted index with precomputed facet counts for in-stock products."""
+
+    def __init__(self, records=None, version_path=config["catalog_sync"]["version_path"]):
+        self.version_path = version_path
+        self._version_mtime = self._current_mtime()
+        self.build(records)
+
+    def build(self, records=None):
+        """(Re)build the index from catalog records keyed by product ID."""
+        records = records if records is not None else CatalogSync.load_records()
+        products_by_category = {}
+        for product_id, properties in records.items():
+            if properties.get("stock_status") != "In stock":
+                continue
+            for category in split_categories(properties.get("categories")):
+                products_by_category.setdefault(category, set()).add(str(product_id))
+
+        counts = dict(sorted(
+            ((category, len(product_ids)) for category, product_ids in products_by_category.items()),
+            key=lambda item: (-item[1], item[0])
+        ))
+        # Swapped in with one assignment so concurrent Gradio handlers never see a half-built index
+        self._index = (products_by_category, counts)
+        logging.info(f"Category index built with {len(counts)} categories.")
+
+    @property
+    def products_by_category(self):
+        return self._index[0]
+
+    @property
+    def counts(self):
+        return self._index[1]
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.version_path).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Rebuild if a new catalog version was published since the last build."""
+        mtime = self._current_mtime()
+        if mtime == self._version_mtime:
+            return False
+        self._version_mtime = mtime
+        self.build()
+        return True
+
+    def product_ids(self, categories):
+        """IDs of in-stock products in any of the given categories."""
+        products_by_category = self.products_by_category
+        product_ids = set()
+        for category in categories:
+            product_ids |= products_by_category.get(category, set())
+        return product_ids
+
+    def facets(self):
+        """(label, value) pairs such as ("Almonds (12)", "Almonds"), most populated first."""
+        return [(f"{category} ({count})", category) for category, count in self.counts.items()]
@@ -2,31 +2,85 @@ import gradio as gr
 from weaviate.classes.query import Filter
 
 from src.utils import logging
+from .autocomplete import ProductAutocomplete
+from .facets import CategoryIndex
 
 class GradioSearchApp:
-    def __init__(self, search_engine):
+    def __init__(self, search_engine, autocomplete=None, category_index=None):
         self.search_engine = search_engine
-        self.interface = gr.Interface(
-            fn=self.gradio_search,
-            inputs=[
-                gr.Textbox(label="Search Query"),
-                gr.Number(label="Max Price (Optional)", value=None),
-                gr.Number(label="Min Rating (Optional)", value=None),
-                gr.Radio(["Hybrid Search", "Keyword Search"], label="Search Type")
-            ],
-            outputs="html",
-            title="AI-Powered Product Search"
-        )
-    
-    def gradio_search(self, query, price_filter, rating_filter, search_type):
+        self.autocomplete = autocomplete or ProductAutocomplete()
+        self.category_index = category_index or CategoryIndex()
+
+        with gr.Blocks(title="AI-Powered Product Search") as self.interface:
+            gr.Markdown("# AI-Powered Product Search")
+            query = gr.Textbox(label="Search Query")
+            suggestions = gr.Radio([], label="Suggestions")
+            price_filter = gr.Number(label="Max Price (Optional)", value=None)
+            rating_filter = gr.Number(label="Min Rating (Optional)", value=None)
+            category_filter = gr.Dropdown(
+                choices=self.category_index.facets(), multiselect=True, label="Categories (Optional)"
+            )
+            search_type = gr.Radio(["Hybrid Search", "Keyword Search"], label="Search Type")
+            search_button = gr.Button("Search")
+            results = gr.HTML()
+
+            # Typeahead runs outside the queue: it only touches the in-memory prefix index
+            query.change(
+                self.suggestion_choices, inputs=query, outputs=suggestions,
+                queue=False, show_progress="hidden", trigger_mode="always_last", api_name=False
+            )
+            suggestions.input(lambda choice: choice, inputs=suggestions, outputs=query, queue=False, api_name=False)
+
+            # API-only endpoint returning the raw suggestions
+            autocomplete_button = gr.Button(visible=False)
+            autocomplete_button.click(
+                self.suggest, inputs=query, outputs=gr.JSON(visible=False),
+                queue=False, api_name="autocomplete"
+            )
+
+            search_button.click(
+                self.gradio_search,
+                inputs=[query, price_filter, rating_filter, search_type, category_filter],
+                outputs=results
+            )
+
+            # Pick up new facet counts after a catalog sync on each page load
+            self.interface.load(self.category_choices, outputs=category_filter, queue=False, api_name=False)
+
+    def suggest(self, query):
+        """Typeahead suggestions for the text typed so far."""
         try:
+            self.autocomplete.refresh()
+            return self.autocomplete.suggest(query)
+        except Exception as e:
+            logging.error(f"Error building suggestions: {e}")
+            return []
+
+    def suggestion_choices(self, query):
+        return gr.update(choices=[suggestion["text"] for suggestion in self.suggest(query)], value=None)
+
+    def category_choices(self):
+        self.category_index.refresh()
+        return gr.update(choices=self.category_index.facets())
+
+    def gradio_search(self, query, price_filter, rating_filter, search_type, category_filter=None):
+        try:
+            self.category_index.refresh()
             filters = Filter.by_property("stock_status").equal("In stock")
-            
+
+            # Exact category membership comes from the category index (same semantics as the facet counts).
+            # Weaviate applies the product_id filter through its inverted index before the vector search.
+            if category_filter:
+                product_ids = self.category_index.product_ids(category_filter)
+                if not product_ids:
+                    return "No matching items found."
+                filters &= Filter.by_property("product_id").contains_any(sorted(product_ids))
+
             if price_filter:
                 filters &= Filter.by_property("price").less_or_equal(float(price_filter))
             if rating_filter:
                 filters &= (Filter.by_property("rating").greater_or_equal(float(rating_filter)) | Filter.by_property("rating").is_none(True))
-            
+
             if search_type == "Hybrid Search":
                 return "\n\n".join(self.search_engine.hybrid_search(query, filters=filters))
             elif search_type == "Keyword Search":
@@ -36,7 +90,7 @@ class GradioSearchApp:
         except Exception as e:
             logging.error(f"Error processing search: {e}")
             return "Error: Search failed."
-    
+
     def launch(self):
         try:
             self.interface.launch()
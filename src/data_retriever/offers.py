@@ -76,6 +76,16 @@ class OffersDatabase:
             logging.error(f"Error fetching offers for product {product_id}: {e}")
             return []
 
+    def fetch_all(self):
+        """Fetch every offer row."""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM offers")
+            return cursor.fetchall()
+        except Exception as e:
+            logging.error(f"Error fetching offers: {e}")
+            return []
+
     def close(self):
         """Close the database connection."""
         if self.conn:
@@ -0,0 +1,163 @@
+import os
+import json
+import mmap
+import shutil
+
+import numpy as np
+
+from src.utils import logging
+from .catalog_sync import CatalogSync
+from .offers import OffersDatabase
+
+
+class SharedCatalog:
+    """Read-only product metadata and offers index stored as flat files that worker processes mmap.
+
+    Each record is a JSON blob in one .bin file, located through a sorted key array and an offsets
+    array saved as .npy. Everything is opened read-only, so the OS page cache holds a single copy
+    however many workers read it, and lookups never touch sqlite or Weaviate.
+
+    Every build goes into its own v<catalog version> directory and `current.json` points at the
+    latest one. Files that workers have mapped are never rewritten; refresh() reopens the new ones.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._pointer_mtime = None
+        self.version = None
+        self._files = None
+        self.refresh()
+
+    @staticmethod
+    def _pointer_path(directory):
+        return os.path.join(directory, "current.json")
+
+    def refresh(self):
+        """Reopen the catalog files if a newer build was published. Cheap no-op when nothing changed."""
+        pointer_path = self._pointer_path(self.directory)
+        mtime = os.stat(pointer_path).st_mtime
+        if mtime == self._pointer_mtime:
+            return False
+        with open(pointer_path, "r", encoding="utf-8") as file:
+            pointer = json.load(file)
+
+        path = os.path.join(self.directory, pointer["path"])
+        # Swap the whole set at once so concurrent lookups never mix two versions
+        self._files = {
+            "product_ids": self._load_array(path, "product_ids.npy"),
+            "product_offsets": self._load_array(path, "products_offsets.npy"),
+            "products": self._map(path, "products.bin"),
+            "offer_product_ids": self._load_array(path, "offer_product_ids.npy"),
+            "offer_indices": self._load_array(path, "offer_indices.npy"),
+            "offer_offsets": self._load_array(path, "offers_offsets.npy"),
+            "offers": self._map(path, "offers.bin"),
+        }
+        self._pointer_mtime = mtime
+        if self.version is not None and self.version != pointer["version"]:
+            logging.info(f"Shared catalog reopened at version {pointer['version']}.")
+        self.version = pointer["version"]
+        return True
+
+    @staticmethod
+    def _load_array(path, name):
+        return np.load(os.path.join(path, name), mmap_mode="r")
+
+    @staticmethod
+    def _map(path, name):
+        with open(os.path.join(path, name), "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _key(product_id):
+        return str(product_id).strip().encode("utf-8")
+
+    @staticmethod
+    def _write_blobs(directory, name, items):
+        blobs = [json.dumps(item, ensure_ascii=False).encode("utf-8") for item in items]
+        offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(blob) for blob in blobs])
+        with open(os.path.join(directory, f"{name}.bin"), "wb") as file:
+            file.write(b"".join(blobs))
+        np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+
+    @classmethod
+    def build(cls, directory, records=None, offer_rows=None, version=None):
+        """Write the catalog files for a catalog version into a fresh directory, publish it, then open it."""
+        version = CatalogSync.current_version() if version is None else version
+        records = records if records is not None else CatalogSync.load_records()
+        if offer_rows is None:
+            db = OffersDatabase()
+            db.connect()
+            offer_rows = db.fetch_all()
+            db.close()
+
+        # Written to a temporary directory and renamed into place, so readers only see complete builds
+        name = f"v{version}"
+        build_dir = os.path.join(directory, f"{name}.tmp-{os.getpid()}")
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+
+        product_ids = sorted(records, key=cls._key)
+        np.save(os.path.join(build_dir, "product_ids.npy"), np.array([cls._key(pid) for pid in product_ids], dtype=bytes))
+        cls._write_blobs(build_dir, "products", [records[pid] for pid in product_ids])
+
+        # Offer rows keep the sqlite column order so format_results can unpack them unchanged
+        links = sorted(
+            (cls._key(pid), offer_index)
+            for offer_index, row in enumerate(offer_rows)
+            for pid in json.loads(row[-1])
+        )
+        np.save(os.path.join(build_dir, "offer_product_ids.npy"), np.array([key for key, _ in links], dtype=bytes))
+        np.save(os.path.join(build_dir, "offer_indices.npy"), np.array([index for _, index in links], dtype=np.int32))
+        cls._write_blobs(build_dir, "offers", [list(row) for row in offer_rows])
+
+        # Unlinking files another process has mapped is safe, their mapping stays valid
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        os.rename(build_dir, os.path.join(directory, name))
+        previous = cls._published(directory)
+        pointer_path = cls._pointer_path(directory)
+        with open(f"{pointer_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"version": version, "path": name}, file)
+        os.replace(f"{pointer_path}.tmp", pointer_path)
+        cls._prune(directory, keep={name, previous})
+
+        logging.info(f"Shared catalog version {version} written to {directory}: {len(product_ids)} products, {len(offer_rows)} offers.")
+        return cls(directory)
+
+    @classmethod
+    def _published(cls, directory):
+        try:
+            with open(cls._pointer_path(directory), "r", encoding="utf-8") as file:
+                return json.load(file)["path"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _prune(directory, keep):
+        """Delete old builds, keeping the current one and the one before it (workers may still be opening it)."""
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if entry.startswith("v") and entry not in keep and os.path.isdir(path) and ".tmp-" not in entry:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _blob(self, data, offsets, index):
+        return json.loads(data[int(offsets[index]):int(offsets[index + 1])])
+
+    def product(self, product_id):
+        """Stored properties of one product, or None if it is not in the catalog."""
+        files = self._files
+        key = self._key(product_id)
+        index = int(np.searchsorted(files["product_ids"], key))
+        if index < len(files["product_ids"]) and files["product_ids"][index] == key:
+            return self._blob(files["products"], files["product_offsets"], index)
+        return None
+
+    def offers_for(self, product_id):
+        """Offer rows (same shape as the sqlite offers table) that include the product."""
+        files = self._files
+        key = self._key(product_id)
+        start = int(np.searchsorted(files["offer_product_ids"], key, side="left"))
+        end = int(np.searchsorted(files["offer_product_ids"], key, side="right"))
+        return [tuple(self._blob(files["offers"], files["offer_offsets"], int(index))) for index in files["offer_indices"][start:end]]
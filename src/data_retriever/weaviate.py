@@ -1,24 +1,28 @@
+import time
 import pandas as pd
 import weaviate
 from weaviate.classes.config import Configure
 import weaviate.classes as wvc
 from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
 
 from src.utils import logging, config
 from .offers import OffersDatabase
 from .embedder import ProductEmbedder
+from .facets import split_categories
 
 class WeaviateHandler:
     """Handles connection and data management in Weaviate."""
 
-    def __init__(self):
-        """Initialize Weaviate connection, model, and SQLite database."""
+    def __init__(self, embedder=None, catalog=None):
+        """Initialize Weaviate connection and embedding model.
+        An already loaded `embedder` and a read-only `catalog` (SharedCatalog) can be passed in by worker processes."""
         try:
             self.collection_name = config["weaviate"]["collection_name"]
             self.db_name = config["database"]["name"]
+            self.catalog = catalog
 
-            self.db = OffersDatabase()
-            self.embedder = ProductEmbedder()
+            self.embedder = embedder or ProductEmbedder()
 
             # Initialize Weaviate
             logging.info("Connecting to Weaviate...")
@@ -42,12 +46,49 @@ class WeaviateHandler:
             self.embedder.model = None
 
 
-    def create_schema(self):
+    def build_vector_index_config(self, index_config=None):
+        """Build the named-vector index config from the `weaviate.vector_index` section of config.yaml.
+        Unset (null) values fall back to Weaviate's own defaults."""
+        index_config = index_config or config["weaviate"]["vector_index"]
+        index_type = index_config.get("type", "hnsw")
+        compression = index_config.get("compression") or "none"
+
+        if compression == "pq":
+            if index_type == "flat":
+                raise ValueError("PQ compression is only supported with the hnsw index.")
+            quantizer = Configure.VectorIndex.Quantizer.pq(
+                segments=index_config.get("pq_segments"),
+                centroids=index_config.get("pq_centroids"),
+                training_limit=index_config.get("pq_training_limit")
+            )
+        elif compression == "bq":
+            quantizer = Configure.VectorIndex.Quantizer.bq()
+        elif compression == "none":
+            quantizer = None
+        else:
+            logging.error(f"Compression '{compression}' is not supported.")
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        if index_type == "hnsw":
+            return Configure.VectorIndex.hnsw(
+                ef=index_config.get("ef"),
+                ef_construction=index_config.get("ef_construction"),
+                max_connections=index_config.get("max_connections"),
+                quantizer=quantizer
+            )
+        if index_type == "flat":
+            return Configure.VectorIndex.flat(quantizer=quantizer)
+
+        logging.error(f"Vector index type '{index_type}' is not supported.")
+        raise ValueError(f"Unsupported vector index type: {index_type}")
+
+    def create_schema(self, collection_name=None, index_config=None):
         """Define and create the schema in Weaviate (v4 syntax)."""
+        collection_name = collection_name or self.collection_name
         try:
-            self.client.collections.delete(name=self.collection_name)
+            self.client.collections.delete(name=collection_name)
             self.client.collections.create(
-                name=self.collection_name,
+                name=collection_name,
                 properties=[
                     wvc.config.Property(
                         name="product_id",
@@ -66,7 +107,7 @@ class WeaviateHandler:
                     ),
                     wvc.config.Property(
                         name="categories",
-                        data_type=wvc.config.DataType.TEXT,
+                        data_type=wvc.config.DataType.TEXT_ARRAY,
                         vectorize_property_name=False
                     ),
                     wvc.config.Property(
@@ -93,7 +134,7 @@ class WeaviateHandler:
                 vectorizer_config=[
                     Configure.NamedVectors.none(
                         name="info_vector",
-                        vector_index_config=Configure.VectorIndex.hnsw()
+                        vector_index_config=self.build_vector_index_config(index_config)
                     ),
                 ],
                 inverted_index_config=Configure.inverted_index(
@@ -101,60 +142,126 @@ class WeaviateHandler:
                 )
             )
 
-            logging.info("Schema created successfully.")
+            logging.info(f"Schema created successfully for '{collection_name}'.")
         except Exception as e:
             logging.error(f"Error creating schema: {e}")
             raise
 
 
-    def insert_data(self, df):
-        """Insert product data into Weaviate."""
+    @staticmethod
+    def product_properties(row):
+        """Map a catalog row to Weaviate product properties, turning NaN into None."""
+        return {
+            "product_id": None if pd.isna(row["id"]) else str(row["id"]),
+            "title": None if pd.isna(row["title"]) else str(row["title"]),
+            "price": None if pd.isna(row["price"]) else row["price"],
+            "categories": None if pd.isna(row["categories"]) else split_categories(row["categories"]),
+            "rating": None if pd.isna(row["rating"]) else row["rating"],
+            "weight": None if pd.isna(row["weight"]) else row["weight"],
+            "image": None if pd.isna(row["image"]) else row["image"],
+            "stock_status": None if pd.isna(row["stock_status"]) else row["stock_status"]
+        }
+
+    @staticmethod
+    def product_uuid(product_id):
+        """Deterministic object UUID so a product can be patched or replaced by its ID."""
+        return generate_uuid5(str(product_id))
+
+    def insert_data(self, df, collection_name=None):
+        """Insert product data into Weaviate, replacing objects that already exist."""
         try:
-            collection = self.client.collections.get(self.collection_name)
+            collection = self.client.collections.get(collection_name or self.collection_name)
             logging.info("Inserting data into Weaviate...")
 
-            for _, row in df.iterrows():
-                product = {
-                    "product_id": None if pd.isna(row["id"]) else str(row["id"]),
-                    "title": None if pd.isna(row["title"]) else str(row["title"]),
-                    "price": None if pd.isna(row["price"]) else row["price"],
-                    "categories": None if pd.isna(row["categories"]) else row["categories"],
-                    "rating": None if pd.isna(row["rating"]) else row["rating"],
-                    "weight": None if pd.isna(row["weight"]) else row["weight"],
-                    "image": None if pd.isna(row["image"]) else row["image"],
-                    "stock_status": None if pd.isna(row["stock_status"]) else row["stock_status"]
-                }
-
-                # Add the pre-generated embeddings
-                product["info_vector"] = row["info_vector"].tolist() 
-
-                # Insert the data with the embeddings
-                collection.data.insert(
-                    properties=product,
-                )
+            with collection.batch.fixed_size(batch_size=200) as batch:
+                for _, row in df.iterrows():
+                    product = self.product_properties(row)
+
+                    # Insert the data with the pre-generated embeddings as the named vector
+                    batch.add_object(
+                        properties=product,
+                        uuid=self.product_uuid(product["product_id"]),
+                        vector={"info_vector": row["info_vector"].tolist()}
+                    )
+
+            if collection.batch.failed_objects:
+                logging.error(f"{len(collection.batch.failed_objects)} objects failed to insert.")
+                raise RuntimeError(collection.batch.failed_objects[0].message)
 
             logging.info("Data insertion complete.")
         except Exception as e:
             logging.error(f"Error inserting data: {e}")
             raise
-    
+
+    def update_properties(self, product_id, properties):
+        """Patch scalar properties of one product in place, keeping its stored vector."""
+        try:
+            self.collection.data.update(uuid=self.product_uuid(product_id), properties=properties)
+        except Exception as e:
+            logging.error(f"Error updating product {product_id}: {e}")
+            raise
+
+    def delete_products(self, product_ids):
+        """Delete products by their product_id."""
+        try:
+            if not product_ids:
+                return
+            self.collection.data.delete_many(
+                where=Filter.by_property("product_id").contains_any(list(product_ids))
+            )
+            logging.info(f"Deleted {len(product_ids)} products from Weaviate.")
+        except Exception as e:
+            logging.error(f"Error deleting products: {e}")
+            raise
+
+    def wait_for_indexing(self, collection_name=None, timeout=300):
+        """Block until the async indexing queue of every shard is empty.
+        Returns the shards so callers can inspect e.g. whether compression kicked in."""
+        collection_name = collection_name or self.collection_name
+        deadline = time.time() + timeout
+        while True:
+            nodes = self.client.cluster.nodes(collection=collection_name, output="verbose")
+            shards = [shard for node in nodes for shard in (node.shards or [])]
+            if all(shard.vector_queue_length == 0 and shard.vector_indexing_status == "READY" for shard in shards):
+                return shards
+            if time.time() > deadline:
+                logging.error(f"Timed out waiting for '{collection_name}' to finish indexing.")
+                return shards
+            time.sleep(1)
+
+    def _offer_product(self, product_id):
+        """Properties of a product bundled in an offer, from the shared catalog when available."""
+        if self.catalog:
+            return self.catalog.product(product_id)
+        product_response = self.collection.query.fetch_objects(
+            filters=Filter.by_property("product_id").equal(product_id)
+        )
+        return product_response.objects[0].properties if product_response.objects else None
+
     def format_results(self, response):
         """Format search results into a structured response as a string."""
         products_str = []
         all_offers = {}
 
+        db = None
+        if self.catalog:
+            # Pick up the catalog files rebuilt after a catalog sync
+            self.catalog.refresh()
+        else:
+            # A connection per call keeps concurrent searches from sharing one sqlite handle
+            db = OffersDatabase(self.db_name)
+            db.connect()
+
         for index, obj in enumerate(response.objects, 1):
             product_id = obj.properties.get("product_id", "Unknown")
             title = obj.properties.get("title", "No Title")
-            categories = obj.properties.get("categories", "No Category")
+            categories = ", ".join(obj.properties.get("categories") or []) or "No Category"
             image_url = obj.properties.get("image", "none")
             price = obj.properties.get("price", "N/A")
             weight = obj.properties.get("weight", "N/A")
             rating = obj.properties.get("rating", "N/A")
 
-            self.db.connect()
-            offers = self.db.find_offers_by_product(product_id)
-            self.db.close()
+            offers = self.catalog.offers_for(product_id) if self.catalog else db.find_offers_by_product(product_id)
 
             product_str = f"Product {index} - ID: {product_id}\n"
             product_str += f"Title: {title}\n"
@@ -179,11 +286,8 @@ class WeaviateHandler:
                         }
 
                     for pid in product_ids:
-                        product_response = self.collection.query.fetch_objects(
-                            filters=Filter.by_property("product_id").equal(pid)
-                        )
-                        if product_response.objects:
-                            product_obj = product_response.objects[0].properties
+                        product_obj = self._offer_product(pid)
+                        if product_obj:
                             product_image = product_obj.get("image", "none")
                             product_title = product_obj.get("title", "No Title")
                             all_offers[offer_id]["products"].append({
@@ -202,6 +306,9 @@ class WeaviateHandler:
             
             products_str.append(product_str)
 
+        if db:
+            db.close()
+
         offers_str = ""
         if all_offers:
             offers_str = "Offers:\n"
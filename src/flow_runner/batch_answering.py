@@ -0,0 +1,33 @@
+import json
+import argparse
+
+from src.llm import LLMHandler, BatchAnswerer
+from src.utils import logging, config
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Answer a file of queries in one offline batch.")
+    parser.add_argument("--input", default=config["batch"]["queries_path"], help="Text file (one query per line) or JSONL with a 'query' field.")
+    parser.add_argument("--output", default=config["batch"]["output_path"], help="JSONL file to write the answers to.")
+    parser.add_argument("--retrieval-workers", type=int, default=config["batch"]["retrieval_workers"])
+    parser.add_argument("--max-concurrency", type=int, default=config["batch"]["max_concurrency"])
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use abatch instead of batch.")
+    parser.add_argument("--fake-llm", action="store_true", help="Use the local offline model instead of the configured provider.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    answerer = None
+    try:
+        answerer = BatchAnswerer(
+            llmhandler=LLMHandler(provider="fake" if args.fake_llm else None),
+            retrieval_workers=args.retrieval_workers,
+            max_concurrency=args.max_concurrency,
+            use_async=args.use_async,
+        )
+        stats = answerer.run(args.input, args.output)
+        print(json.dumps(stats, indent=2))
+    except Exception as e:
+        logging.error(f"Fatal error: {e}")
+    finally:
+        if answerer:
+            answerer.close()
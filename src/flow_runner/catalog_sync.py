@@ -0,0 +1,26 @@
+import pandas as pd
+
+from src.utils import logging, config
+from src.data_retriever import WeaviateHandler, CatalogSync
+
+def sync_products():
+    """Apply only the changes in the products CSV since the last ingest, without rebuilding the collection."""
+    weaviate_handler = None
+    try:
+        df = pd.read_csv(config['input_file']['cleaned_products_data_path'])
+        logging.info("File successfully read")
+
+        weaviate_handler = WeaviateHandler()
+        summary = CatalogSync(weaviate_handler).sync(df)
+        logging.info(f"Catalog sync complete: {summary}")
+        print(summary)
+
+    except Exception as main_error:
+        logging.critical(f"Critical Error: {main_error}")
+
+    finally:
+        if weaviate_handler:
+            weaviate_handler.close()
+
+if __name__ == "__main__":
+    sync_products()
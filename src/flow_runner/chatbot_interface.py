@@ -1,9 +1,26 @@
-from src.llm import ChatbotHandler
-from src.utils import logging
+import argparse
+
+from src.llm import ChatbotHandler, LLMHandler, WorkerServer
+from src.utils import logging, config
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Launch the chatbot.")
+    parser.add_argument(
+        "--workers", type=int, nargs="?", const=config["serving"]["workers"], default=None,
+        help="Serve the streaming chat API with N pre-forked worker processes on one port instead of the Gradio UI."
+    )
+    parser.add_argument("--fake-llm", action="store_true", help="Use the local offline model instead of the configured provider.")
+    parser.add_argument("--fake-latency", type=float, default=None, help="Seconds per offline model call, overriding fake_llm.latency.")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    provider = "fake" if args.fake_llm else None
     try:
-        chatbot_handler = ChatbotHandler()
-        chatbot_handler.launch_chatbot()
+        if args.workers:
+            WorkerServer(workers=args.workers, provider=provider, fake_latency=args.fake_latency).serve()
+        else:
+            chatbot_handler = ChatbotHandler(llmhandler=LLMHandler(provider=provider, fake_latency=args.fake_latency))
+            chatbot_handler.launch_chatbot()
     except Exception as e:
         logging.error(f"Fatal error: {e}")
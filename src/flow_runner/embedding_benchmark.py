@@ -0,0 +1,105 @@
+import json
+import time
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from src.utils import logging, config
+from src.data_retriever import ProductEmbedder
+
+# (label, model_type, quantize)
+BACKENDS = [
+    ("torch", "sentencetransformer", None),
+    ("onnx-fp32", "onnx", False),
+    ("onnx-int8", "onnx", True),
+]
+
+def current_rss_mb():
+    """Resident set size of this process, falling back to the peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def profile_backend(model_type, quantize, texts, queries):
+    """Load one backend and time it. Runs in a fresh process so RSS only reflects this backend."""
+    baseline_rss = current_rss_mb()
+
+    start = time.perf_counter()
+    embedder = ProductEmbedder(model_type=model_type, quantize=quantize)
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        embedder.model.encode(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = np.asarray(embedder.model.encode(texts), dtype=np.float32)
+    catalog_seconds = time.perf_counter() - start
+
+    rss = current_rss_mb()
+    stats = {
+        "load_seconds": round(load_seconds, 2),
+        "query_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "query_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "catalog_seconds": round(catalog_seconds, 2),
+        "rss_mb": round(rss, 1),
+        "model_rss_mb": round(rss - baseline_rss, 1),
+    }
+    return stats, embeddings
+
+def parity(reference, candidate, k):
+    """Cosine agreement per product, plus how many of each product's top-k neighbours survive."""
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = np.sum(reference * candidate, axis=1)
+
+    # Exclude each product itself from its neighbour list
+    reference_scores = reference @ reference.T
+    candidate_scores = candidate @ candidate.T
+    np.fill_diagonal(reference_scores, -np.inf)
+    np.fill_diagonal(candidate_scores, -np.inf)
+    reference_top = np.argpartition(-reference_scores, k, axis=1)[:, :k]
+    candidate_top = np.argpartition(-candidate_scores, k, axis=1)[:, :k]
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(reference_top, candidate_top)]
+
+    return {
+        "cosine_mean": round(float(cosines.mean()), 5),
+        "cosine_min": round(float(cosines.min()), 5),
+        f"neighbour_overlap@{k}": round(float(np.mean(overlap)), 4),
+    }
+
+def benchmark_embedding_backends():
+    """Compare the torch model against its ONNX Runtime exports on the product catalog."""
+    benchmark_config = config["embedding_benchmark"]
+    df = pd.read_csv(config['input_file']['cleaned_products_data_path'])
+    texts = ProductEmbedder.combined_text(df).tolist()
+    queries = df["title"].dropna().sample(
+        n=min(benchmark_config["num_queries"], len(df)), random_state=0
+    ).tolist()
+
+    results = []
+    reference = None
+    for label, model_type, quantize in BACKENDS:
+        logging.info(f"Benchmarking embedding backend {label}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            stats, embeddings = pool.submit(profile_backend, model_type, quantize, texts, queries).result()
+
+        if reference is None:
+            reference = embeddings
+        result = {"backend": label, **stats, **parity(reference, embeddings, benchmark_config["k"])}
+        logging.info(f"Embedding benchmark result: {result}")
+        results.append(result)
+    return results
+
+if __name__ == "__main__":
+    for result in benchmark_embedding_backends():
+        print(json.dumps(result))
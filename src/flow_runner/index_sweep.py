@@ -0,0 +1,118 @@
+import re
+import json
+import time
+import urllib.request
+import numpy as np
+import pandas as pd
+
+from src.utils import logging, config
+from src.data_retriever import WeaviateHandler
+
+def exact_knn(product_vectors, query_vectors, k):
+    """Exact cosine top-k with NumPy, used as the recall baseline."""
+    products = product_vectors / np.linalg.norm(product_vectors, axis=1, keepdims=True)
+    queries = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    scores = queries @ products.T
+    top_k = np.argpartition(-scores, k, axis=1)[:, :k]
+    return [set(row) for row in top_k]
+
+def weaviate_heap_mb(metrics_url):
+    """Read Weaviate's in-use Go heap from its Prometheus endpoint, or None if unavailable."""
+    try:
+        with urllib.request.urlopen(metrics_url, timeout=5) as response:
+            metrics = response.read().decode("utf-8")
+        match = re.search(r"^go_memstats_heap_inuse_bytes (\S+)$", metrics, re.MULTILINE)
+        return round(float(match.group(1)) / 2**20, 1) if match else None
+    except Exception as e:
+        logging.error(f"Could not read Weaviate metrics: {e}")
+        return None
+
+def estimated_index_mb(setting, num_vectors, dimensions, compressed):
+    """Rough in-memory size of the vector index for one setting.
+    `compressed` is what the shards report, so a quantizer that never trained is sized as uncompressed."""
+    compression = (setting.get("compression") or "none") if compressed else "none"
+    if compression == "pq":
+        vector_bytes = setting.get("pq_segments") or dimensions // 4
+    elif compression == "bq":
+        vector_bytes = dimensions / 8
+    else:
+        vector_bytes = dimensions * 4
+    # flat keeps only the (optionally compressed) vectors, hnsw adds ~2*maxConnections edges per node on layer 0
+    graph_bytes = 0 if setting.get("type") == "flat" else 2 * (setting.get("max_connections") or 32) * 8
+    return round(num_vectors * (vector_bytes + graph_bytes) / 2**20, 2)
+
+def run_setting(handler, setting, df, query_vectors, ground_truth, sweep_config):
+    """Rebuild the sweep collection with one index setting and measure recall, latency and memory."""
+    collection_name = sweep_config["collection_name"]
+    k = sweep_config["k"]
+    row_to_id = df["id"].astype(str).tolist()
+
+    handler.create_schema(collection_name=collection_name, index_config=setting)
+    build_start = time.perf_counter()
+    handler.insert_data(df, collection_name=collection_name)
+    shards = handler.wait_for_indexing(collection_name=collection_name)
+    build_seconds = time.perf_counter() - build_start
+
+    collection = handler.client.collections.get(collection_name)
+    latencies = []
+    recalls = []
+    for query_vector, expected_rows in zip(query_vectors, ground_truth):
+        start = time.perf_counter()
+        response = collection.query.near_vector(
+            near_vector=query_vector.tolist(),
+            limit=k,
+            target_vector="info_vector",
+            return_properties=["product_id"]
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {obj.properties["product_id"] for obj in response.objects}
+        # duplicate product ids in the catalog can collapse the expected set below k
+        expected = {row_to_id[row] for row in expected_rows}
+        recalls.append(len(found & expected) / len(expected))
+
+    compressed = any(getattr(shard, "compressed", False) for shard in shards)
+    if (setting.get("compression") or "none") != "none" and not compressed:
+        logging.warning(f"Setting {setting['name']} requested {setting['compression']} but the index is not compressed.")
+    return {
+        "setting": setting["name"],
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "build_seconds": round(build_seconds, 2),
+        "compressed": compressed,
+        "estimated_index_mb": estimated_index_mb(setting, len(df), query_vectors.shape[1], compressed),
+        "weaviate_heap_mb": weaviate_heap_mb(sweep_config["metrics_url"]),
+    }
+
+def sweep_index_settings():
+    """Compare every `index_sweep.settings` entry against an exact kNN baseline in a scratch collection."""
+    sweep_config = config["index_sweep"]
+    handler = WeaviateHandler()
+    results = []
+    try:
+        df = pd.read_csv(config['input_file']['cleaned_products_data_path'])
+        df = handler.embedder.generate_embeddings(df)
+        product_vectors = np.vstack(df["info_vector"].to_numpy()).astype(np.float32)
+
+        queries = df["title"].dropna().sample(
+            n=min(sweep_config["num_queries"], len(df)), random_state=0
+        ).tolist()
+        query_vectors = np.asarray(handler.embedder.model.encode(queries), dtype=np.float32)
+        ground_truth = exact_knn(product_vectors, query_vectors, sweep_config["k"])
+
+        for setting in sweep_config["settings"]:
+            logging.info(f"Sweeping index setting {setting['name']}")
+            result = run_setting(handler, setting, df, query_vectors, ground_truth, sweep_config)
+            logging.info(f"Index sweep result: {result}")
+            results.append(result)
+    except Exception as e:
+        logging.critical(f"Index sweep failed: {e}")
+    finally:
+        if handler.client:
+            handler.client.collections.delete(name=sweep_config["collection_name"])
+        handler.close()
+    return results
+
+if __name__ == "__main__":
+    for result in sweep_index_settings():
+        print(json.dumps(result))
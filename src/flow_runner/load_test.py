@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import signal
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from src.utils import logging, config
+from src.llm import BatchAnswerer
+
+def request_json(url, payload=None, timeout=60):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read().decode("utf-8")
+
+def wait_until_ready(base_url, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            request_json(f"{base_url}/health", timeout=2)
+            return True
+        except Exception:
+            time.sleep(1)
+    return False
+
+def run_load(base_url, queries, concurrency, duration):
+    """Keep `concurrency` clients sending chat requests for `duration` seconds."""
+    deadline = time.time() + duration
+
+    def client(offset):
+        latencies, errors = [], 0
+        index = offset
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                request_json(f"{base_url}/chat", {"message": queries[index % len(queries)], "history": []})
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors += 1
+            index += 1
+        return latencies, errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "throughput_rps": round(len(latencies) / duration, 2),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1) if latencies else None,
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1) if latencies else None,
+    }
+
+def load_test():
+    """Start the multi-worker server for each worker count with the offline LLM and measure throughput scaling.
+    The offline LLM answers without simulated latency, so the measurement reflects CPU work
+    (retrieval, embedding, formatting) only. A sleeping model would scale with client count, not workers."""
+    test_config = config["load_test"]
+    base_url = f"http://127.0.0.1:{config['serving']['port']}"
+    queries = BatchAnswerer.load_queries(config["batch"]["queries_path"])
+    worker_counts = [count for count in test_config["worker_counts"] if count <= (os.cpu_count() or 1)]
+
+    results = []
+    for workers in worker_counts:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.flow_runner.chatbot_interface", "--workers", str(workers), "--fake-llm", "--fake-latency", "0"],
+            start_new_session=True
+        )
+        try:
+            if not wait_until_ready(base_url, test_config["startup_timeout"]):
+                logging.error(f"Server with {workers} workers did not start.")
+                continue
+            # Warm up every worker before measuring
+            run_load(base_url, queries, workers * test_config["concurrency_per_worker"], 3)
+
+            result = {"workers": workers, **run_load(
+                base_url, queries, workers * test_config["concurrency_per_worker"], test_config["duration"]
+            )}
+            result["worker_load"] = [
+                load["requests"] for load in json.loads(request_json(f"{base_url}/workers"))["workers"]
+            ]
+            results.append(result)
+            logging.info(f"Load test result: {result}")
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+    if results:
+        baseline = results[0]["throughput_rps"] / results[0]["workers"]
+        for result in results:
+            speedup = result["throughput_rps"] / baseline if baseline else 0.0
+            result["speedup"] = round(speedup, 2)
+            result["scaling_efficiency"] = round(speedup / result["workers"], 2)
+    return results
+
+if __name__ == "__main__":
+    for result in load_test():
+        print(json.dumps(result))
@@ -1,6 +1,6 @@
-from src.data_retriever import WeaviateHandler, GradioChatbotApp
+from src.data_retriever import WeaviateHandler, GradioSearchApp
 
 if __name__ == "__main__":
     weaviate_handler = WeaviateHandler()
-    app = GradioChatbotApp(weaviate_handler)
+    app = GradioSearchApp(weaviate_handler)
     app.launch()
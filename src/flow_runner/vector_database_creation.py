@@ -1,7 +1,7 @@
 import pandas as pd
 
 from src.utils import logging, config
-from src.data_retriever import WeaviateHandler, ProductEmbedder
+from src.data_retriever import WeaviateHandler, ProductEmbedder, CatalogSync
 
 def process_and_store_products():
     """Reads product data, generates embeddings, and stores in Weaviate."""
@@ -19,6 +19,10 @@ def process_and_store_products():
         weaviate_handler = WeaviateHandler()
         weaviate_handler.create_schema()
         weaviate_handler.insert_data(df)
+        weaviate_handler.wait_for_indexing()
+
+        # Baseline for incremental catalog_sync runs
+        CatalogSync(weaviate_handler).save_snapshot(df)
     
     except Exception as main_error:
         logging.critical(f"Critical Error: {main_error}")
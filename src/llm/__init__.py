@@ -1,4 +1,6 @@
 from .llm import LLMHandler
 from .chatbot_handler import ChatbotHandler
+from .batch_answerer import BatchAnswerer
+from .worker_server import WorkerServer
 
-__all__ = ["LLMHandler","ChatbotHandler"]
\ No newline at end of file
+__all__ = ["LLMHandler","ChatbotHandler","BatchAnswerer","WorkerServer"]
\ No newline at end of file
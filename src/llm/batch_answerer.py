@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .llm import LLMHandler
+from src.data_retriever import WeaviateHandler
+from src.utils import logging, config
+
+
+class BatchAnswerer:
+    """Answers a file of queries offline: concurrent retrieval, then one batched LLM call."""
+
+    def __init__(self, llmhandler=None, search_engine=None,
+                 retrieval_workers=config["batch"]["retrieval_workers"],
+                 max_concurrency=config["batch"]["max_concurrency"],
+                 use_async=False):
+        self.llmhandler = llmhandler or LLMHandler()
+        self.search_engine = search_engine or WeaviateHandler()
+        self.retrieval_workers = retrieval_workers
+        self.max_concurrency = max_concurrency
+        self.use_async = use_async
+
+    @staticmethod
+    def load_queries(input_path):
+        """Read queries from a text file (one per line) or a JSONL file with a "query" field."""
+        queries = []
+        with open(input_path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                if input_path.endswith(".jsonl"):
+                    line = json.loads(line)["query"]
+                queries.append(line)
+        logging.info(f"Loaded {len(queries)} queries from {input_path}")
+        return queries
+
+    def _search(self, query):
+        """Hybrid search for one query. Returns (knowledge, error), exactly one of them set."""
+        try:
+            knowledge = self.search_engine.hybrid_search(query)
+        except Exception as e:
+            return None, str(e)
+        # hybrid_search reports failures as a one-item list instead of a results string
+        if isinstance(knowledge, list):
+            return None, "\n".join(knowledge)
+        return knowledge, None
+
+    def retrieve(self, queries):
+        """Run hybrid search for every query on a bounded thread pool, preserving order."""
+        with ThreadPoolExecutor(max_workers=self.retrieval_workers) as pool:
+            return list(pool.map(self._search, queries))
+
+    def generate(self, prompts):
+        """Send all prompts to the model in one batch call."""
+        if self.use_async:
+            return asyncio.run(self.llmhandler.abatch(prompts, max_concurrency=self.max_concurrency))
+        return self.llmhandler.batch(prompts, max_concurrency=self.max_concurrency)
+
+    def run(self, input_path, output_path):
+        """Answer every query in `input_path`, write JSONL to `output_path` and return throughput stats."""
+        queries = self.load_queries(input_path)
+        start = time.perf_counter()
+
+        retrieved = self.retrieve(queries)
+        retrieval_seconds = time.perf_counter() - start
+
+        # Queries whose retrieval failed are not sent to the model, so they can't produce made-up answers
+        answerable = [index for index, (_, error) in enumerate(retrieved) if error is None]
+        prompts = [self.llmhandler.build_prompt(queries[index], retrieved[index][0], []) for index in answerable]
+        generation_start = time.perf_counter()
+        responses = [None] * len(queries)
+        for index, response in zip(answerable, self.generate(prompts) if prompts else []):
+            responses[index] = response
+        generation_seconds = time.perf_counter() - generation_start
+
+        failures = 0
+        input_tokens = 0
+        cached_input_tokens = 0
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as file:
+            for query, (_, retrieval_error), response in zip(queries, retrieved, responses):
+                record = {"query": query, "answer": None, "error": None}
+                if retrieval_error is not None:
+                    failures += 1
+                    record["error"] = f"Retrieval failed: {retrieval_error}"
+                    logging.error(f"Batch retrieval failed for '{query}': {retrieval_error}")
+                elif isinstance(response, Exception):
+                    failures += 1
+                    record["error"] = str(response)
+                    logging.error(f"Batch answer failed for '{query}': {response}")
+                else:
+                    record["answer"] = response.content
+                    usage = response.usage_metadata or {}
+                    input_tokens += usage.get("input_tokens", 0)
+                    cached_input_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        total_seconds = time.perf_counter() - start
+        stats = {
+            "queries": len(queries),
+            "failures": failures,
+            "retrieval_seconds": round(retrieval_seconds, 3),
+            "generation_seconds": round(generation_seconds, 3),
+            "total_seconds": round(total_seconds, 3),
+            "queries_per_second": round(len(queries) / total_seconds, 2) if total_seconds else 0.0,
+            "input_tokens": input_tokens,
+            "cached_input_tokens": cached_input_tokens,
+        }
+        logging.info(f"Batch answers written to {output_path}: {stats}")
+        return stats
+
+    def close(self):
+        self.search_engine.close()
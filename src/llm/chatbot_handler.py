@@ -6,9 +6,22 @@ from src.utils import logging
 
 
 class ChatbotHandler:
-    def __init__(self):
-        self.llmhandler = LLMHandler()
-        self.search_engine = WeaviateHandler()
+    def __init__(self, llmhandler=None, search_engine=None):
+        self.llmhandler = llmhandler or LLMHandler()
+        self.search_engine = search_engine or WeaviateHandler()
+
+    def stream_answer(self, message, history):
+        """Retrieve knowledge for the message and yield the answer chunk by chunk."""
+        knowledge = self.search_engine.hybrid_search(message)
+
+        logging.info(f"Received message: {message}")
+
+        rag_prompt = self.llmhandler.build_prompt(
+            message, knowledge, history
+        )
+
+        for response in self.llmhandler.stream(rag_prompt):
+            yield response.content
 
     def stream_response(self, message, history):
         """
@@ -16,19 +29,11 @@ class ChatbotHandler:
         If knowledge is not found or if an error occurs, it logs the event.
         """
         try:
-            knowledge = self.search_engine.hybrid_search(message)
-            
-            logging.info(f"Received message: {message}")
-
             if message is not None:
                 partial_message = ""
 
-                rag_prompt = self.llmhandler.process_with_llm(
-                    message, knowledge, history
-                )
-
-                for response in self.llmhandler.stream(rag_prompt):
-                    partial_message += response.content
+                for chunk in self.stream_answer(message, history):
+                    partial_message += chunk
                     yield partial_message
         except Exception as e:
             logging.error(f"Error during message processing: {e}")
@@ -0,0 +1,34 @@
+import time
+import asyncio
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class OfflineChatModel(BaseChatModel):
+    """Local stand-in for a chat model so batch runs work without network access."""
+
+    response: str = "This is an offline answer."
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "offline-fake"
+
+    def _result(self, messages):
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        content = f"{self.response} (prompt: {prompt_chars} chars)"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        """Simulate a blocking provider call."""
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        """Simulate a non-blocking provider call so abatch overlaps requests."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages)
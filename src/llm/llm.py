@@ -3,13 +3,16 @@ from langchain_mistralai import ChatMistralAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
-from langchain.prompts import PromptTemplate
+from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import HumanMessage, AIMessage
 
 from src.utils import logging, config
+from .fake_llm import OfflineChatModel
 
 class LLMHandler:
-    def __init__(self):
-        self.llm_provider = config["llm"]["provider"]
+    def __init__(self, provider=None, fake_latency=None):
+        self.llm_provider = provider or config["llm"]["provider"]
+        self.fake_latency = config["fake_llm"]["latency"] if fake_latency is None else fake_latency
         try:
             logging.info(f"Initializing LLMHandler with provider {self.llm_provider}")
             llm_mapping = {
@@ -20,6 +23,7 @@ class LLMHandler:
                 "llama3-70b-8192": self._init_groq,
                 "mixtral-8x7b-32768": self._init_groq,
                 "gemma-7b-it": self._init_groq,
+                "fake": self._init_fake,
             }
 
             if self.llm_provider in llm_mapping:
@@ -34,25 +38,18 @@ class LLMHandler:
             raise
 
         try:
-            self.prompt_template = PromptTemplate(
-                input_variables=["user_query", "search_results", "history"],
-                template="""
+            # Static instructions go first and never change, so provider-side prompt caching can reuse them.
+            # History follows as real chat turns (append-only within a conversation), then the per-request
+            # knowledge and query last.
+            self.prompt_template = ChatPromptTemplate.from_messages([
+                ("system", """
                 You are an AI-powered salesman assistant for **Rifai.com**, helping users find the best products based on their queries. 
                 Rifai.com specializes in selling **premium nuts, chocolates, dried fruits, coffee, and gourmet gift boxes**.
 
                 You will be given:  
-                - **User History**: Previous interactions with the user to maintain context.  
-                - **User Query**: The latest question or request from the user.  
-                - **Available Products & Offers**: A list of relevant products and any available offers.  
-
-                ## Conversation History:
-                {history}
-
-                ## User Query:
-                {user_query}
-
-                ## Available Products with Offers (Knowledge):
-                {search_results}
+                - **User History**: Previous interactions with the user to maintain context, as earlier chat messages.  
+                - **Available Products & Offers**: A list of relevant products and any available offers, in the latest message.  
+                - **User Query**: The latest question or request from the user, at the end of the latest message.  
 
                 ### Instructions:
                 1. **Product Selection Criteria:**
@@ -71,7 +68,7 @@ class LLMHandler:
                 - For greetings like "hello", keep the response friendly and short without providing irrelevant information.
 
                 4. **If the user asks about products not sold by Rifai.com:**
-                - Inform them: **"Rifai.com specializes in premium nuts, chocolates, dried fruits, coffee, and gourmet gift boxes. We do not sell {user_query}."**
+                - Inform them: **"Rifai.com specializes in premium nuts, chocolates, dried fruits, coffee, and gourmet gift boxes. We do not sell [requested product]."**, replacing [requested product] with what the user asked for.
                 - Suggest similar products if available.
 
                 5. **If no products are found:**
@@ -83,22 +80,46 @@ class LLMHandler:
                 - Always mention offers if there are any.
                 - Prioritize clarity, accuracy, and helpfulness.
 
-                Now generate a concise, engaging, and visually appealing response.
-                """
-            )
+                Generate a concise, engaging, and visually appealing response.
+                """),
+                MessagesPlaceholder("history"),
+                ("human", """
+                ## Available Products with Offers (Knowledge):
+                {search_results}
+
+                ## User Query:
+                {user_query}
+                """),
+            ])
             logging.info("Prompt template initialized successfully")
         except Exception as e:
             logging.error(f"Error initializing prompt template: {e}")
             raise
 
-    def stream(self,message):
-        return self.llm.stream(message)
+    def log_usage(self, usage_metadata):
+        """Log token usage, including input tokens served from the provider's prompt cache."""
+        if not usage_metadata:
+            return
+        input_tokens = usage_metadata.get("input_tokens", 0)
+        cached_tokens = (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+        cached_share = 100 * cached_tokens / input_tokens if input_tokens else 0.0
+        logging.info(
+            f"LLM usage: input={input_tokens} cached={cached_tokens} ({cached_share:.0f}%) "
+            f"output={usage_metadata.get('output_tokens', 0)}"
+        )
+
+    def stream(self, messages):
+        for chunk in self.llm.stream(messages):
+            # Usage arrives on the final chunk when the provider reports it
+            self.log_usage(chunk.usage_metadata)
+            yield chunk
 
     def _init_openai(self):
         self.llm = ChatOpenAI(
             openai_api_key=config["openai"]["api_key"],
             temperature=config["llm"]["temperature"],
-            model=config["openai"]["model"]
+            model=config["openai"]["model"],
+            stream_usage=True
         )
 
     def _init_azure_openai(self):
@@ -108,7 +129,8 @@ class LLMHandler:
             temperature=config["llm"]["temperature"],
             openai_api_key=config["azure_openai"]["api_key"],
             azure_endpoint=config["azure_openai"]["azure_endpoint"],
-            max_retries=2
+            max_retries=2,
+            stream_usage=True
         )
     
     def _init_gemini(self):
@@ -133,25 +155,40 @@ class LLMHandler:
             temperature=config["llm"]["temperature"],
             max_retries=2,
         )
-        
 
-    def process_with_llm(self, user_query, search_results, history):
-        try:
-            logging.info(f"Processing query: {user_query}")
-            formatted_history = "\n".join([f"User: {user}\nAssistant: {bot}" for user, bot in history[-5:]])
+    def _init_fake(self):
+        self.llm = OfflineChatModel(
+            response=config["fake_llm"]["response"],
+            latency=self.fake_latency,
+        )
 
-            formatted_prompt = self.prompt_template.format(
-                user_query=user_query,
-                search_results=search_results,
-                history=formatted_history
-            )
-            
-            ai_msg = self.llm.invoke(formatted_prompt)
+    def build_prompt(self, user_query, search_results, history):
+        """Fill the RAG prompt template with the last few turns of history, as chat messages."""
+        formatted_history = []
+        for user, bot in history[-5:]:
+            formatted_history += [HumanMessage(content=user), AIMessage(content=bot)]
 
-            logging.info("Response generated successfully")
-            return ai_msg.content
+        return self.prompt_template.format_messages(
+            user_query=user_query,
+            search_results=search_results,
+            history=formatted_history
+        )
 
-        except Exception as e:
-            logging.error(f"Error during processing: {e}")
-            raise
-    
+    def batch(self, prompts, max_concurrency=None):
+        """Run many prompts through the model, at most `max_concurrency` at a time.
+        Failed prompts come back as exceptions instead of aborting the whole batch."""
+        logging.info(f"Running batch of {len(prompts)} prompts (max_concurrency={max_concurrency})")
+        responses = self.llm.batch(prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for response in responses:
+            if not isinstance(response, Exception):
+                self.log_usage(response.usage_metadata)
+        return responses
+
+    async def abatch(self, prompts, max_concurrency=None):
+        """Async counterpart of `batch`, overlapping requests on the event loop."""
+        logging.info(f"Running async batch of {len(prompts)} prompts (max_concurrency={max_concurrency})")
+        responses = await self.llm.abatch(prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for response in responses:
+            if not isinstance(response, Exception):
+                self.log_usage(response.usage_metadata)
+        return responses
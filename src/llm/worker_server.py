@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+import signal
+import socket
+import multiprocessing
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .llm import LLMHandler
+from .chatbot_handler import ChatbotHandler
+from src.data_retriever import WeaviateHandler, ProductEmbedder, SharedCatalog, CatalogSync
+from src.utils import logging, config
+
+# Layout of each worker's slot in the shared load array
+REQUESTS, IN_FLIGHT, BUSY_SECONDS, ERRORS = range(4)
+SLOT_SIZE = 4
+
+
+class ChatRequest(BaseModel):
+    message: str
+    history: list = []
+
+
+class WorkerServer:
+    """Pre-fork chatbot API: N worker processes accept connections on one shared listening socket.
+
+    The parent builds the shared catalog files, loads (or exports) the embedding model and binds the port, then forks.
+    It rebuilds the catalog files when catalog_sync publishes a new version; workers reopen them on their next search.
+    Workers open their own Weaviate and LLM clients, since network connections are not fork-safe.
+    The API is stateless (history travels with each request), so any worker can serve any request.
+    The Gradio UI keeps its sessions in process memory and therefore stays single-process.
+    """
+
+    def __init__(self, workers=config["serving"]["workers"], host=config["serving"]["host"],
+                 port=config["serving"]["port"], provider=None, fake_latency=None):
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.provider = provider
+        self.fake_latency = fake_latency
+        self.catalog_dir = config["serving"]["catalog_dir"]
+        self.threads_per_worker = config["serving"]["threads_per_worker"]
+        self.report_interval = config["serving"]["report_interval"]
+        self.catalog_check_interval = config["serving"]["catalog_check_interval"]
+        self.catalog_version = None
+        self.embedder = None
+        self.stats = None
+        self.sock = None
+
+    def _prepare(self):
+        """Work done once in the parent and shared with every worker after fork."""
+        self.catalog_version = SharedCatalog.build(self.catalog_dir).version
+
+        # Torch weights loaded here are shared copy-on-write. ONNX Runtime sessions own thread pools
+        # that do not survive fork, so for that backend only the export files are written here and
+        # each worker creates its own session from them.
+        if config["embedding"]["model_type"] == "sentencetransformer":
+            self.embedder = ProductEmbedder()
+        elif config["embedding"]["model_type"] == "onnx":
+            ProductEmbedder.ensure_onnx_export()
+
+        self.stats = multiprocessing.get_context("fork").Array("d", self.workers * SLOT_SIZE)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(2048)
+
+    def _refresh_catalog(self):
+        """Rebuild the shared catalog files if catalog_sync published a new version since the last build."""
+        try:
+            version = CatalogSync.current_version()
+            if version != self.catalog_version:
+                self.catalog_version = SharedCatalog.build(self.catalog_dir, version=version).version
+        except Exception as e:
+            logging.error(f"Error rebuilding the shared catalog: {e}")
+
+    def _record(self, index, field, delta):
+        with self.stats.get_lock():
+            self.stats[index * SLOT_SIZE + field] += delta
+
+    def worker_load(self):
+        """Requests served, requests in flight, busy seconds and errors for every worker."""
+        with self.stats.get_lock():
+            values = self.stats[:]
+        return [
+            {
+                "worker": index,
+                "requests": int(values[index * SLOT_SIZE + REQUESTS]),
+                "in_flight": int(values[index * SLOT_SIZE + IN_FLIGHT]),
+                "busy_seconds": round(values[index * SLOT_SIZE + BUSY_SECONDS], 2),
+                "errors": int(values[index * SLOT_SIZE + ERRORS]),
+            }
+            for index in range(self.workers)
+        ]
+
+    def create_app(self, index, chatbot):
+        app = FastAPI(title="AI-Powered Chatbot Salesman")
+
+        @app.post("/chat")
+        def chat(request: ChatRequest):
+            def generate():
+                self._record(index, IN_FLIGHT, 1)
+                start = time.perf_counter()
+                try:
+                    for chunk in chatbot.stream_answer(request.message, request.history):
+                        yield chunk
+                except Exception as e:
+                    logging.error(f"Worker {index} error during message processing: {e}")
+                    self._record(index, ERRORS, 1)
+                    yield "Sorry, there was an error processing your request."
+                finally:
+                    self._record(index, IN_FLIGHT, -1)
+                    self._record(index, REQUESTS, 1)
+                    self._record(index, BUSY_SECONDS, time.perf_counter() - start)
+
+            return StreamingResponse(generate(), media_type="text/plain")
+
+        @app.get("/workers")
+        def workers():
+            return {"served_by": index, "workers": self.worker_load()}
+
+        @app.get("/health")
+        def health():
+            return {"status": "ok", "worker": index, "pid": os.getpid()}
+
+        return app
+
+    def _run_worker(self, index):
+        """Entry point of a forked worker: per-process clients, then serve on the inherited socket."""
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(self.threads_per_worker)
+
+        search_engine = WeaviateHandler(embedder=self.embedder, catalog=SharedCatalog(self.catalog_dir))
+        chatbot = ChatbotHandler(llmhandler=LLMHandler(provider=self.provider, fake_latency=self.fake_latency), search_engine=search_engine)
+        logging.info(f"Worker {index} (pid {os.getpid()}) ready.")
+        try:
+            uvicorn.Server(uvicorn.Config(self.create_app(index, chatbot), log_level="warning")).run(sockets=[self.sock])
+        finally:
+            search_engine.close()
+
+    def serve(self):
+        """Fork the workers and report their load until interrupted."""
+        self._prepare()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=self._run_worker, args=(index,)) for index in range(self.workers)]
+        for process in processes:
+            process.start()
+        logging.info(f"Serving on http://{self.host}:{self.port} with {self.workers} workers.")
+
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, stop)
+        last_report = time.time()
+        try:
+            while any(process.is_alive() for process in processes):
+                time.sleep(self.catalog_check_interval)
+                self._refresh_catalog()
+                if time.time() - last_report >= self.report_interval:
+                    logging.info(f"Worker load: {self.worker_load()}")
+                    last_report = time.time()
+        except KeyboardInterrupt:
+            logging.info("Shutting down workers...")
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            self.sock.close()